@@ -1,5 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from duckduckgo_search import DDGS
+from duckduckgo_search.exceptions import DuckDuckGoSearchException, TimeoutException
 from crewai.tools import tool
+from deadline import DeadlineExceeded, current_deadline, record_overrun, stage_timeout
+
+# Default DDGS request timeout (seconds) when no run deadline is set
+SEARCH_TIMEOUT = 10
+
+SEARCH_SKIPPED = "Search skipped: the run deadline is exceeded. Proceed with the results you already have."
+SEARCH_TIMED_OUT = "Search timed out. Proceed with the results you already have."
+
+# A DDGS call can chain several requests (news: vqd + result pages), so under a
+# deadline the whole call runs here and is bounded as one
+_search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ddgs")
+
+def _is_timeout(error):
+    # text() wraps the backend's TimeoutException in a DuckDuckGoSearchException
+    return isinstance(error, TimeoutException) or any(isinstance(arg, TimeoutException) for arg in error.args)
+
+def _search_overrun():
+    deadline = current_deadline()
+    if deadline:
+        deadline.overrun("search")
+    else:
+        record_overrun("search")
+
+def _search(call):
+    """Run a DDGS call within the search slice of the run deadline"""
+    try:
+        timeout = stage_timeout("search", SEARCH_TIMEOUT)
+    except DeadlineExceeded:
+        return SEARCH_SKIPPED
+    try:
+        if current_deadline() is None:
+            return call(DDGS(timeout=timeout))
+        # A call still running after its slice finishes in the background, bounded by its request timeout
+        return _search_executor.submit(call, DDGS(timeout=timeout)).result(timeout=timeout)
+    except FutureTimeout:
+        _search_overrun()
+        return SEARCH_TIMED_OUT
+    except DuckDuckGoSearchException as e:
+        if not _is_timeout(e):
+            raise
+        _search_overrun()
+        return SEARCH_TIMED_OUT
 
 class DuckSearchTool:
     @tool("web search")
@@ -10,7 +54,7 @@ class DuckSearchTool:
         Args: query (str): The search query.
         Returns: list: List of search results with content and url sources.
         """
-        return DDGS().text(query, max_results=10, timelimit="y")
+        return _search(lambda ddgs: ddgs.text(query, max_results=10, timelimit="y"))
 
     @tool("recent search")
     def recent_search(query: str):
@@ -20,7 +64,7 @@ class DuckSearchTool:
         Args: query (str): The search query.
         Returns: list: List of instant answers results.
         """
-        return DDGS().text(query, max_results=5, timelimit="d")
+        return _search(lambda ddgs: ddgs.text(query, max_results=5, timelimit="d"))
 
     @tool("summary search")
     def summary_search(query: str):
@@ -30,7 +74,7 @@ class DuckSearchTool:
         Args: query (str): The search query.
         Returns: list: List of instant answers results.
         """
-        return DDGS().answers(query)
+        return _search(lambda ddgs: ddgs.answers(query))
 
     @tool("news search")
     def news_search(query: str):
@@ -41,7 +85,7 @@ class DuckSearchTool:
         Returns: list: List of news results with title, body, date, source and url.
         """
         try:
-            return DDGS().news(query, timelimit="w", max_results=10)
+            return _search(lambda ddgs: ddgs.news(query, timelimit="w", max_results=10))
         except Exception as e:
             return f"Error searching news: {str(e)}"
 
@@ -52,7 +96,7 @@ class DuckSearchTool:
         Args: text (str): The text to translate.
         Returns: str: Translated text.
         """
-        return DDGS().translate(text, source_language='auto', target_language='fr')
+        return _search(lambda ddgs: ddgs.translate(text, source_language='auto', target_language='fr'))
 
     @tool("ai chat")
     def ai_chat(query: str, model: str = 'gpt-3.5'):
@@ -63,7 +107,7 @@ class DuckSearchTool:
             model (str): AI model to use ('gpt-3.5', 'claude-3-haiku', 'llama-3-70b', 'mixtral-8x7b').
         Returns: str: AI response.
         """
-        return DDGS().chat(query, model=model)
+        return _search(lambda ddgs: ddgs.chat(query, model=model))
 
     @tool("image search")
     def image_search(query: str, max_results: int = 10):
@@ -74,7 +118,7 @@ class DuckSearchTool:
             max_results (int): Maximum number of results.
         Returns: list: List of image search results.
         """
-        return DDGS().images(query, max_results=max_results)
+        return _search(lambda ddgs: ddgs.images(query, max_results=max_results))
 
     @tool("video search")
     def video_search(query: str, max_results: int = 10):
@@ -85,7 +129,7 @@ class DuckSearchTool:
             max_results (int): Maximum number of results.
         Returns: list: List of video search results.
         """
-        return DDGS().videos(query, max_results=max_results)
+        return _search(lambda ddgs: ddgs.videos(query, max_results=max_results))
 
     @tool("map search")
     def map_search(query: str, max_results: int = 10):
@@ -96,4 +140,4 @@ class DuckSearchTool:
             max_results (int): Maximum number of results.
         Returns: list: List of map search results.
         """
-        return DDGS().maps(query, max_results=max_results)
+        return _search(lambda ddgs: ddgs.maps(query, max_results=max_results))
@@ -0,0 +1,189 @@
+"""Benchmark agents memory backends: run time, call counts and prompt size.
+
+Offline (default): replays the memory work of a newsletter run (recall before
+each task, remember after it) against synthetic outputs, for "off" and
+"local". With GOOGLE_API set, "crewai" is replayed too through CrewAI's
+short-term memory with Gemini embeddings.
+
+"off" is the baseline: it does no memory work, so its counters are zero by
+construction.
+
+Live (--live TOPIC): runs the real crew twice per backend ("off", "local",
+"crewai") sharing one memory, so the "cold" run starts empty and the "warm"
+run recalls what the cold one saved. Reports wall time, LLM calls, embedding
+calls, memory store calls and prompt tokens. Needs GOOGLE_API.
+
+    uv run python bench_memory.py
+    uv run python bench_memory.py --live "Green Energy" --model gemini/gemini-2.0-flash
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+
+WORDS = ("ai energy solar market policy chip model launch research funding climate space "
+         "startup regulation data robot battery grid satellite vaccine network").split()
+TOPICS = ("Green Energy", "Space Exploration", "Artificial Intelligence", "Biotech")
+AGENT_NAMES = ("news_agent", "writer_agent")
+
+def fake_output(rng, topic, words=1500):
+    # Mention the topic now and then, as real newsletters do
+    return " ".join(topic if i % 50 == 0 else rng.choice(WORDS) for i in range(words))
+
+def estimate_tokens(text):
+    # Rough Gemini tokenization: ~4 characters per token
+    return len(text) // 4
+
+def bench_offline_local(runs, mode, seed=0):
+    from news_agents import NewsAgents
+    from news_tasks import NewsTasks
+    agents = NewsAgents("bench", memory=mode)
+    tasks = NewsTasks()
+    rng = random.Random(seed)
+    added_tokens = 0
+    start = time.perf_counter()
+    for run in range(runs):
+        topic = rng.choice(TOPICS)
+        for name in AGENT_NAMES:
+            memory = agents.local_memory(name)
+            description = tasks._with_memory("task", memory, topic)
+            added_tokens += estimate_tokens(description) - estimate_tokens("task")
+            callback = tasks._remember_callback(memory, topic)
+            if callback:
+                callback(fake_output(rng, topic))
+    elapsed = time.perf_counter() - start
+    stats = Counter()
+    if mode == "local":
+        for name in AGENT_NAMES:
+            stats.update(agents.local_memory(name).stats())
+    return {
+        "seconds": elapsed,
+        "external_embed_calls": 0,
+        "local_embed_calls": stats["embed_calls"],
+        "store_saves": stats["saves"],
+        "store_searches": stats["searches"],
+        "added_prompt_tokens": added_tokens,
+    }
+
+def bench_offline_crewai(runs, seed=0):
+    from crewai.memory.short_term.short_term_memory import ShortTermMemory
+    from news_agents import NewsAgents
+    agents = NewsAgents("bench", memory="crewai")
+    rng = random.Random(seed)
+    added_tokens = saves = searches = 0
+    with tempfile.TemporaryDirectory() as path:
+        memory = ShortTermMemory(embedder_config=agents.embedder(), path=path)
+        start = time.perf_counter()
+        for run in range(runs):
+            topic = rng.choice(TOPICS)
+            for name in AGENT_NAMES:
+                recalled = memory.search(topic)
+                searches += 1
+                added_tokens += sum(estimate_tokens(str(item.get("context", ""))) for item in recalled)
+                memory.save(fake_output(rng, topic), {"topic": topic})
+                saves += 1
+        elapsed = time.perf_counter() - start
+    return {
+        "seconds": elapsed,
+        "external_embed_calls": agents.embedder_function.calls,
+        "local_embed_calls": 0,
+        "store_saves": saves,
+        "store_searches": searches,
+        "added_prompt_tokens": added_tokens,
+    }
+
+def bench_offline(runs):
+    results = {mode: bench_offline_local(runs, mode) for mode in ("off", "local")}
+    if os.getenv('GOOGLE_API'):
+        results["crewai"] = bench_offline_crewai(runs)
+    else:
+        print("crewai backend skipped: needs GOOGLE_API for Gemini embeddings")
+    return results
+
+def run_live(topic, model_name, mode, memory_store, counts, reset=False):
+    from crewai import Crew, Process
+    from news_agents import NewsAgents
+    from news_tasks import NewsTasks
+    counts.clear()
+    agents = NewsAgents(model_name, memory=mode, memory_store=memory_store)
+    tasks = NewsTasks()
+    news_agent = agents.news_agent()
+    writer_agent = agents.writer_agent()
+    news_task = tasks.news_task(topic, news_agent, agents.local_memory("news_agent"))
+    writer_task = tasks.writer_task(topic, writer_agent, news_task, agents.local_memory("writer_agent"))
+    crew = Crew(agents=[news_agent, writer_agent], tasks=[news_task, writer_task],
+                process=Process.sequential, verbose=False,
+                memory=agents.crew_memory(),
+                embedder=agents.embedder() if agents.crew_memory() else None)
+    if reset and agents.crew_memory():
+        # CrewAI memory persists on disk: empty it so the cold run starts cold
+        for memory_type in ("short", "long", "entity"):
+            crew.reset_memories(command_type=memory_type)
+    local_before = Counter()
+    for name in AGENT_NAMES:
+        if agents.local_memory(name):
+            local_before.update(agents.local_memory(name).stats())
+
+    start = time.perf_counter()
+    result = crew.kickoff(inputs={"topic": topic})
+    elapsed = time.perf_counter() - start
+
+    usage = getattr(result, 'token_usage', None)
+    local = Counter()
+    for name in AGENT_NAMES:
+        if agents.local_memory(name):
+            local.update(agents.local_memory(name).stats())
+    local.subtract(local_before)
+    return {
+        "seconds": elapsed,
+        "llm_calls": counts["llm_calls"],
+        "external_embed_calls": agents.embedder_function.calls if agents.embedder_function else 0,
+        "local_embed_calls": local["embed_calls"],
+        "store_saves": counts["store_saves"] + local["saves"],
+        "store_searches": counts["store_searches"] + local["searches"],
+        "prompt_tokens": getattr(usage, 'prompt_tokens', None),
+    }
+
+def bench_live(topic, model_name):
+    from crewai.events import crewai_event_bus, MemoryQueryStartedEvent, MemorySaveStartedEvent
+    from crewai.events.types.llm_events import LLMCallStartedEvent
+
+    counts = Counter()
+    @crewai_event_bus.on(LLMCallStartedEvent)
+    def count_llm_call(source, event):
+        counts["llm_calls"] += 1
+    @crewai_event_bus.on(MemorySaveStartedEvent)
+    def count_memory_save(source, event):
+        counts["store_saves"] += 1
+    @crewai_event_bus.on(MemoryQueryStartedEvent)
+    def count_memory_query(source, event):
+        counts["store_searches"] += 1
+
+    results = {}
+    for mode in ("off", "local", "crewai"):
+        # One memory shared by both runs of a backend
+        memory_store = {}
+        for phase in ("cold", "warm"):
+            results[f"{mode}/{phase}"] = run_live(topic, model_name, mode, memory_store, counts,
+                                                  reset=phase == "cold")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50, help="Simulated runs for the offline benchmark")
+    parser.add_argument("--live", metavar="TOPIC", help="Run the real crew on TOPIC for each backend")
+    parser.add_argument("--model", default="gemini/gemini-2.0-flash", help="Model for the live benchmark")
+    args = parser.parse_args()
+
+    results = bench_live(args.live, args.model) if args.live else bench_offline(args.runs)
+    if not args.live:
+        print("off is the no-memory baseline: its memory counters are zero by construction")
+    for mode, stats in results.items():
+        print(f"{mode:>11} : " + ", ".join(
+            f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+            for key, value in stats.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Share of the remaining budget given to each stage when it starts.
+# "crew" keeps the last 10% of the run for the PDF export, the agents
+# then split the crew budget.
+STAGE_SHARES = {
+    "crew": 0.9,
+    "news_agent": 0.5,
+    "writer_agent": 1.0,
+    "search": 0.25,
+    "pdf": 1.0,
+}
+
+# Overrun events per stage, for the whole process
+OVERRUNS = Counter()
+
+_current = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a stage starts after the run budget is spent.
+
+    A TimeoutError, so CrewAI stops the agent instead of retrying the task.
+    """
+
+    def __init__(self, stage):
+        super().__init__(f"Run deadline exceeded during '{stage}'")
+        self.stage = stage
+
+
+class Deadline:
+    """Run-level time budget shared by search, LLM and export stages"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self._end = time.monotonic() + seconds
+        self._cancelled = False
+        # Stages whose overrun is already counted for this deadline
+        self._overruns = set()
+
+    def remaining(self):
+        return max(0.0, self._end - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def slice(self, stage, minimum=1.0):
+        """Seconds granted to a stage: its share of what's left, never below minimum"""
+        return max(minimum, self.remaining() * STAGE_SHARES.get(stage, 1.0))
+
+    def sub(self, stage):
+        """Child deadline for a stage, cancelling it leaves the parent budget untouched"""
+        return Deadline(self.slice(stage, minimum=0.0))
+
+    def overrun(self, stage):
+        """Count an overrun of a stage, once per deadline, and not after cancel()"""
+        if self._cancelled or stage in self._overruns:
+            return
+        self._overruns.add(stage)
+        record_overrun(stage)
+
+    def check(self, stage):
+        """Count an overrun and raise if the budget is spent"""
+        if self.expired:
+            self.overrun(stage)
+            raise DeadlineExceeded(stage)
+
+    def cancel(self):
+        """Expire the budget now so remaining stages stop early"""
+        self._end = time.monotonic()
+        self._cancelled = True
+
+
+def record_overrun(stage):
+    OVERRUNS[stage] += 1
+
+def overrun_counts():
+    return dict(OVERRUNS)
+
+def current_deadline():
+    """Deadline of the run in progress, or None"""
+    return _current.get()
+
+@contextmanager
+def use_deadline(deadline):
+    """Make a deadline current for the code (and tools) run in this context"""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+def stage_timeout(stage, default):
+    """Timeout for a stage from the current deadline, or default when there's none"""
+    deadline = current_deadline()
+    if deadline is None:
+        return default
+    deadline.check(stage)
+    return min(default, deadline.slice(stage)) if default else deadline.slice(stage)
@@ -0,0 +1,138 @@
+import hashlib
+import re
+import numpy as np
+
+# Memory backends an agent can be configured with:
+# - "crewai" : CrewAI built-in memory (embedding calls + vector store)
+# - "local"  : in-process NumPy index with a local hashing embedder
+# - "off"    : no memory at all
+MEMORY_MODES = ("crewai", "local", "off")
+
+
+# Frequent words carrying no topic, dropped before hashing
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+news newsletter week date source url https http www com
+""".split())
+
+
+class HashingEmbedder:
+    """Local embedder using the hashing trick on word tokens (no external calls)"""
+
+    def __init__(self, dim=1024):
+        self.dim = dim
+        self.calls = 0
+
+    def _bucket(self, token):
+        digest = hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+        value = int.from_bytes(digest, 'little')
+        # Lowest bit gives the sign, the rest gives the bucket
+        return (value >> 1) % self.dim, 1.0 if value & 1 else -1.0
+
+    def embed(self, texts):
+        """Embed a list of texts into L2-normalized vectors"""
+        self.calls += 1
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in re.findall(r'\w+', text.lower()):
+                if token in STOPWORDS:
+                    continue
+                index, sign = self._bucket(token)
+                vectors[row, index] += sign
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class LocalVectorIndex:
+    """Compact in-memory vector index with cosine similarity search, bounded in size"""
+
+    def __init__(self, dim, max_items=200):
+        self.dim = dim
+        self.max_items = max_items
+        self._vectors = np.zeros((max_items, dim), dtype=np.float32)
+        self._items = []
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, vector, item):
+        size = len(self._items)
+        if size == self.max_items:
+            # Full: drop the oldest item
+            self._vectors[:-1] = self._vectors[1:]
+            self._items.pop(0)
+            size -= 1
+        self._vectors[size] = vector
+        self._items.append(item)
+
+    def search(self, vector, limit=3, score_threshold=0.0):
+        """Return (score, item) pairs sorted by decreasing similarity"""
+        size = len(self._items)
+        if not size:
+            return []
+        scores = self._vectors[:size] @ vector
+        top = np.argsort(-scores)[:limit]
+        return [(float(scores[i]), self._items[i]) for i in top if scores[i] >= score_threshold]
+
+    def reset(self):
+        self._vectors[:] = 0
+        self._items = []
+
+
+class LocalMemory:
+    """Per-agent local memory: remembers task outputs and recalls related ones"""
+
+    def __init__(self, dim=1024, chunk_size=400, max_items=200):
+        self.embedder = HashingEmbedder(dim)
+        self.index = LocalVectorIndex(dim, max_items)
+        self.chunk_size = chunk_size
+        self.saves = 0
+        self.searches = 0
+
+    def _chunks(self, text):
+        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+
+    def remember(self, text, metadata=None):
+        """Store text (split in chunks) with optional metadata"""
+        chunks = self._chunks(text or "")
+        if not chunks:
+            return
+        self.saves += 1
+        for vector, chunk in zip(self.embedder.embed(chunks), chunks):
+            self.index.add(vector, {"context": chunk, "metadata": metadata or {}})
+
+    def recall(self, query, limit=2, score_threshold=0.2):
+        """Return the stored chunks most similar to the query (a short topic works best)"""
+        if not len(self.index):
+            return []
+        self.searches += 1
+        vector = self.embedder.embed([query])[0]
+        return [
+            {"context": item["context"], "metadata": item["metadata"], "score": score}
+            for score, item in self.index.search(vector, limit, score_threshold)
+        ]
+
+    def reset(self):
+        self.index.reset()
+
+    def stats(self):
+        """Call counters, used by the benchmarks"""
+        return {
+            "embed_calls": self.embedder.calls,
+            "saves": self.saves,
+            "searches": self.searches,
+            "items": len(self.index),
+        }
+
+
+def get_local_memory(store, name):
+    """Get (or create) the local memory for an agent name in store.
+
+    store is a dict owned by the caller, e.g. st.session_state, so memories
+    are never shared between sessions.
+    """
+    memories = store.setdefault('local_memories', {})
+    if name not in memories:
+        memories[name] = LocalMemory()
+    return memories[name]
@@ -1,7 +1,9 @@
 import streamlit as st
 from crewai import Agent, LLM
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
+from chromadb.api.types import EmbeddingFunction
 from DuckSearchTools import DuckSearchTool
+from local_memory import MEMORY_MODES, get_local_memory
 import re
 import os
 from dotenv import load_dotenv
@@ -9,14 +11,62 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+class GeminiEmbedder(EmbeddingFunction):
+    """Gemini embeddings for CrewAI memory, counting embedding calls"""
+
+    def __init__(self, api_key, model="models/text-embedding-004"):
+        self.embeddings = GoogleGenerativeAIEmbeddings(model=model, google_api_key=api_key)
+        self.calls = 0
+
+    def __call__(self, input):
+        self.calls += 1
+        return self.embeddings.embed_documents(list(input))
+
 # AGENTS
 class NewsAgents():
-    def __init__(self, model_name):
+    def __init__(self, model_name, memory="local", deadline=None, memory_store=None):
         self.model_name = model_name
+        # Optional run deadline, bounds every LLM call
+        self.deadline = deadline
+        # Memory backend: one of MEMORY_MODES, or a dict per agent name
+        # e.g. {"news_agent": "local", "writer_agent": "off"}.
+        # CrewAI memory is crew-wide: if one agent uses "crewai", all agents share it.
+        self.memory = memory
+        # Where local memories live, e.g. st.session_state to keep them per session
+        self.memory_store = memory_store if memory_store is not None else {}
+        self.embedder_function = None
         # Initialize tool instance
         self.search_tools = DuckSearchTool()
+
+    def memory_mode(self, agent_name):
+        """Memory backend configured for an agent"""
+        if isinstance(self.memory, dict):
+            mode = self.memory.get(agent_name, "local")
+        else:
+            mode = self.memory
+        if mode not in MEMORY_MODES:
+            raise ValueError(f"Unknown memory mode '{mode}' for {agent_name}. Use one of {MEMORY_MODES}.")
+        return mode
+
+    def local_memory(self, agent_name):
+        """Local memory of an agent, or None when it doesn't use the local backend"""
+        if self.memory_mode(agent_name) == "local":
+            return get_local_memory(self.memory_store, agent_name)
+        return None
+
+    def crew_memory(self):
+        """Whether the crew should turn on CrewAI memory"""
+        return any(self.memory_mode(name) == "crewai" for name in ("news_agent", "writer_agent"))
+
+    def embedder(self):
+        """Embedder config for CrewAI memory, using Gemini instead of CrewAI's OpenAI default"""
+        api_key = os.getenv('GOOGLE_API')
+        if not api_key:
+            raise ValueError("GOOGLE_API environment variable not found. Please set it in your .env file.")
+        self.embedder_function = GeminiEmbedder(api_key)
+        return {"provider": "custom", "config": {"embedder": self.embedder_function}}
     
-    def llm(self):
+    def llm(self, stage=None):
         api_key = os.getenv('GOOGLE_API')
         if not api_key:
             raise ValueError("GOOGLE_API environment variable not found. Please set it in your .env file.")
@@ -24,12 +74,24 @@ class NewsAgents():
         llm = LLM(
             model=f"{self.model_name}",
             temperature=0.2,
-            api_key=api_key
+            api_key=api_key,
+            timeout=self.deadline.slice(stage) if self.deadline else None
         )
         return llm
     
+    def deadline_step(self, llm, stage):
+        """Step callback stopping the agent once the deadline is spent,
+        otherwise re-slicing the timeout of its next LLM call"""
+        if not self.deadline:
+            return None
+        def step(_):
+            self.deadline.check(stage)
+            llm.timeout = self.deadline.slice(stage)
+        return step
+
     # News aggregator agent
     def news_agent(self):
+        llm = self.llm("news_agent")
         return Agent(
             role="News Aggregator",
             goal="""Collect the most relevant and engaging 11 news stories for {topic}'s audience. 
@@ -39,15 +101,16 @@ class NewsAgents():
             insightful coverage. You have a keen eye for identifying the most impactful and interesting news stories 
             related to {topic}.""",
             verbose=True,
-            memory=True,
             max_iter=5,
             allow_delegation=False,
             tools=[self.search_tools.news_search],  # Use instance method
-            llm=self.llm(),
+            llm=llm,
+            step_callback=self.deadline_step(llm, "news_agent"),
         )
     
     # Writer agent
     def writer_agent(self):
+        llm = self.llm("writer_agent")
         return Agent(
             role="News Letter Writer",
             goal="Craft compelling and detailed News Letter on {topic} based on the collection of news articles",
@@ -55,10 +118,10 @@ class NewsAgents():
             high-quality and engaging content. You have a knack for taking complex information and making it 
             accessible and interesting for a broad audience.""",
             verbose=True,
-            memory=True,
             max_iter=5,
             allow_delegation=False,
-            llm=self.llm()
+            llm=llm,
+            step_callback=self.deadline_step(llm, "writer_agent")
         )
 
 class StreamToExpander:
@@ -1,9 +1,12 @@
 import streamlit as st
 import sys
 import os
-from crewai import Crew, Process
-from news_agents import NewsAgents, StreamToExpander
-from news_tasks import NewsTasks
+import time
+import shutil
+import uuid
+from news_agents import StreamToExpander
+from news_crew import TheCrew
+from deadline import Deadline, overrun_counts
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.pdfgen import canvas
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -16,6 +19,9 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+# Below this many seconds left, the PDF isn't built: reportlab's build can't be interrupted
+PDF_MIN_SECONDS = 1.0
+
 # Set page configuration
 st.set_page_config(page_title="AI News Letter", page_icon="📰", layout="wide")
 
@@ -58,8 +64,19 @@ def clean_text_for_pdf(text):
     
     return text.strip()
 
-def create_combined_pdf(topic_name, news_content, writer_content):
-    """Create a combined PDF from both reports"""
+def create_combined_pdf(topic_name, news_content, writer_content, deadline=None):
+    """Create a combined PDF from both reports.
+
+    With a deadline the build is skipped when less than PDF_MIN_SECONDS are left.
+    A started build runs to the end, an overrun is only counted afterwards.
+    """
+    if deadline:
+        pdf_budget = deadline.slice("pdf", minimum=0.0)
+        if pdf_budget < PDF_MIN_SECONDS:
+            deadline.overrun("pdf")
+            st.warning("Run deadline reached before building the PDF. Rerun the page to build it.")
+            return None
+    started = time.monotonic()
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, 
                            rightMargin=72, leftMargin=72,
@@ -124,40 +141,14 @@ def create_combined_pdf(topic_name, news_content, writer_content):
     # Build PDF
     try:
         doc.build(story)
+        if deadline and time.monotonic() - started > pdf_budget:
+            deadline.overrun("pdf")
         buffer.seek(0)
         return buffer
     except Exception as e:
         st.error(f"Error creating PDF: {str(e)}")
         return None
 
-class TheCrew:
-    """Main crew orchestrator class"""
-    
-    def __init__(self, topic, model_name):
-        self.topic = topic
-        self.model_name = model_name
-
-    def run(self):
-        """Execute the crew and return results"""
-        agents = NewsAgents(self.model_name)
-        tasks = NewsTasks()
-
-        news_agent = agents.news_agent()
-        writer_agent = agents.writer_agent()
-
-        news_task = tasks.news_task(self.topic, news_agent)
-        writer_task = tasks.writer_task(self.topic, writer_agent, news_task)
-
-        crew = Crew(
-            agents=[news_agent, writer_agent],
-            tasks=[news_task, writer_task],
-            process=Process.sequential,
-            verbose=True
-        )
-
-        result = crew.kickoff(inputs={"topic": self.topic})
-        return result
-
 # Initialize session state to persist data after download
 if 'newsletter_generated' not in st.session_state:
     st.session_state.newsletter_generated = False
@@ -220,6 +211,20 @@ with st.sidebar:
          "gemini/gemini-2.5-flash-lite", "gemini/gemini-2.5-pro"),
         help="Choose the AI model for content generation"
     )
+
+    # Memory backend selection
+    st.subheader("🧠 Agents Memory", divider="violet")
+    memory_labels = {"Local (in-process)": "local", "CrewAI (embeddings)": "crewai", "Off": "off"}
+    news_memory = st.selectbox("News Aggregator memory", list(memory_labels),
+                               help="Local memory avoids embedding calls and external vector stores")
+    writer_memory = st.selectbox("Newsletter Writer memory", list(memory_labels),
+                                 help="Local memory avoids embedding calls and external vector stores")
+    agents_memory = {"news_agent": memory_labels[news_memory], "writer_agent": memory_labels[writer_memory]}
+
+    # Run deadline
+    st.subheader("⏱️ Run Deadline", divider="violet")
+    deadline_seconds = st.number_input("Deadline (seconds)", min_value=10, max_value=600, value=90, step=10,
+                                       help="Whole run budget shared by search, LLM calls and PDF export")
     st.divider()
 
 # Main input section
@@ -241,7 +246,12 @@ generate_clicked = st.button(
 )
 
 # Main execution logic
-if generate_clicked and topic:
+run_deadline = None
+# A crew stopped at its deadline may still be winding down its last step
+previous_worker = st.session_state.get('crew_worker')
+if generate_clicked and topic and previous_worker and previous_worker.is_alive():
+    st.warning("⏱️ The previous run is still stopping after its deadline. Try again in a few seconds.")
+elif generate_clicked and topic:
     
     # Show progress
     with st.spinner("🤖 AI Agents working on your newsletter..."):
@@ -259,8 +269,17 @@ if generate_clicked and topic:
                 
                 try:
                     # Execute the crew
-                    the_crew = TheCrew(topic, model_name)
+                    run_deadline = Deadline(deadline_seconds)
+                    report_dir = os.path.join('reports', uuid.uuid4().hex)
+                    the_crew = TheCrew(topic, model_name, agents_memory, run_deadline, report_dir,
+                                       memory_store=st.session_state)
                     result = the_crew.run()
+                    st.session_state.crew_worker = the_crew.worker
+                    
+                    # Replace the previous run's reports
+                    if st.session_state.get('report_dir'):
+                        shutil.rmtree(st.session_state.report_dir, ignore_errors=True)
+                    st.session_state.report_dir = report_dir
                     
                     # Store in session state
                     st.session_state.crew_result = result
@@ -272,16 +291,24 @@ if generate_clicked and topic:
                     sys.stdout = original_stdout
             
             # Update status
-            status.update(
-                label=f"✨ Newsletter about '{topic}' generated successfully!",
-                state="complete", 
-                expanded=False
-            )
+            if the_crew.partial:
+                status.update(
+                    label=f"⏱️ Deadline reached: showing the partial newsletter about '{topic}'",
+                    state="error",
+                    expanded=False
+                )
+            else:
+                status.update(
+                    label=f"✨ Newsletter about '{topic}' generated successfully!",
+                    state="complete", 
+                    expanded=False
+                )
 
 # Display results if newsletter has been generated
 if st.session_state.newsletter_generated:
     result = st.session_state.crew_result
     topic = st.session_state.topic_name
+    report_dir = st.session_state.get('report_dir', '.')
     
     # Display the generated newsletter
     st.subheader(f"📰 {topic} Newsletter 🖋️", anchor=False, divider="grey")
@@ -323,7 +350,7 @@ if st.session_state.newsletter_generated:
     
     with final_report_container:
         st.markdown("### 📄 News Aggregation Report")
-        news_content = safe_read_file('report_task_news.md')
+        news_content = safe_read_file(os.path.join(report_dir, 'report_task_news.md'))
         if news_content:
             st.markdown(news_content)
         else:
@@ -332,7 +359,7 @@ if st.session_state.newsletter_generated:
         st.divider()  # Visual separator between reports
         
         st.markdown("### ✍️ Newsletter Writing Report") 
-        writer_content = safe_read_file('report_task_writer.md')
+        writer_content = safe_read_file(os.path.join(report_dir, 'report_task_writer.md'))
         if writer_content:
             st.markdown(writer_content)
         else:
@@ -346,15 +373,17 @@ if st.session_state.newsletter_generated:
     
     with col2:
         # Get both report contents
-        news_content = safe_read_file('report_task_news.md')
-        writer_content = safe_read_file('report_task_writer.md')
+        news_content = safe_read_file(os.path.join(report_dir, 'report_task_news.md'))
+        writer_content = safe_read_file(os.path.join(report_dir, 'report_task_writer.md'))
         
         if news_content or writer_content:
             # Create PDF buffer
             pdf_buffer = create_combined_pdf(
                 st.session_state.topic_name, 
                 news_content, 
-                writer_content
+                writer_content,
+                # Only bounds the PDF built right after generation, reruns have no run deadline
+                run_deadline
             )
             
             if pdf_buffer:
@@ -374,6 +403,11 @@ if st.session_state.newsletter_generated:
         with st.expander('📊 Usage Metrics', expanded=False):
             st.json(result.token_usage)
 
+    # Deadline overruns per stage (since the app started)
+    if overrun_counts():
+        with st.expander('⏱️ Deadline Overruns', expanded=False):
+            st.json(overrun_counts())
+
 # Show empty state when no topic is entered and nothing generated
 elif not topic and not st.session_state.newsletter_generated:
     st.info("👆 Enter a topic above and click 'Generate Newsletter' to create your AI-powered newsletter!")
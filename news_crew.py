@@ -0,0 +1,99 @@
+import threading
+import contextvars
+from crewai import Crew, Process
+from litellm.exceptions import Timeout as LLMTimeout
+from streamlit.runtime.scriptrunner import add_script_run_ctx
+from news_agents import NewsAgents
+from news_tasks import NewsTasks
+from deadline import DeadlineExceeded, use_deadline
+
+
+class TheCrew:
+    """Main crew orchestrator class"""
+    
+    def __init__(self, topic, model_name, memory="local", deadline=None, report_dir=".", memory_store=None):
+        self.topic = topic
+        self.model_name = model_name
+        self.memory = memory
+        self.deadline = deadline
+        # Reports of this run, its own directory keeps an abandoned run from overwriting another's
+        self.report_dir = report_dir
+        # Set when the deadline stopped the run and a partial result was returned
+        self.partial = False
+        # Thread running the crew, may still be winding down after a partial result
+        self.worker = None
+        # Where agents' local memories live, e.g. st.session_state
+        self.memory_store = memory_store
+
+    def run(self):
+        """Execute the crew and return results"""
+        # The crew works within its own slice, the rest is kept for the PDF export
+        crew_deadline = self.deadline.sub("crew") if self.deadline else None
+        agents = NewsAgents(self.model_name, memory=self.memory, deadline=crew_deadline,
+                            memory_store=self.memory_store)
+        tasks = NewsTasks(self.report_dir, crew_deadline)
+
+        news_agent = agents.news_agent()
+        writer_agent = agents.writer_agent()
+
+        news_task = tasks.news_task(self.topic, news_agent, agents.local_memory("news_agent"))
+        writer_task = tasks.writer_task(self.topic, writer_agent, news_task, agents.local_memory("writer_agent"))
+
+        # Keep each finished task output as the best partial result so far
+        outputs = []
+        def on_task_done(output):
+            if crew_deadline and crew_deadline.cancelled:
+                return
+            outputs.append(output)
+            if crew_deadline:
+                # The writer gets its slice of what's left once the aggregator is done
+                writer_agent.llm.timeout = crew_deadline.slice("writer_agent")
+
+        crew = Crew(
+            agents=[news_agent, writer_agent],
+            tasks=[news_task, writer_task],
+            process=Process.sequential,
+            verbose=True,
+            task_callback=on_task_done,
+            memory=agents.crew_memory(),
+            embedder=agents.embedder() if agents.crew_memory() else None
+        )
+
+        if not crew_deadline:
+            return crew.kickoff(inputs={"topic": self.topic})
+        return self._kickoff_with_deadline(crew, crew_deadline, outputs)
+
+    def _kickoff_with_deadline(self, crew, crew_deadline, outputs):
+        """Run the crew in a worker thread and stop waiting when the crew's slice is spent"""
+        state = {}
+        def kickoff():
+            try:
+                with use_deadline(crew_deadline):
+                    state['result'] = crew.kickoff(inputs={"topic": self.topic})
+            except Exception as e:
+                state['error'] = e
+
+        # Copy the context so the worker sees the Streamlit session and the deadline
+        context = contextvars.copy_context()
+        worker = threading.Thread(target=context.run, args=(kickoff,), daemon=True)
+        add_script_run_ctx(worker)
+        self.worker = worker
+        worker.start()
+        worker.join(timeout=crew_deadline.remaining())
+
+        # A hung LLM call ends on its litellm timeout, which CrewAI re-raises without retry
+        if worker.is_alive() or isinstance(state.get('error'), (DeadlineExceeded, LLMTimeout)):
+            # Threads can't be killed: cancel the budget so the agents' step callbacks
+            # stop the crew at their next step
+            crew_deadline.overrun("writer_agent" if outputs else "news_agent")
+            crew_deadline.cancel()
+            # An abandoned task must not write its report over this partial result
+            for task in crew.tasks:
+                task.output_file = None
+            self.partial = True
+            if outputs:
+                return outputs[-1]
+            return "⏱️ The run deadline was reached before any newsletter content was ready."
+        if 'error' in state:
+            raise state['error']
+        return state['result']
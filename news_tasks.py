@@ -1,7 +1,8 @@
 from datetime import datetime
+import os
+import re
 from crewai import Task
 #DuckDuckGoSearchRunTool DuckDuckGoSearchResults DuckDuckGoSearchRun
-from langchain_groq import ChatGroq
 from news_agents import NewsAgents
 
 
@@ -10,13 +11,49 @@ from news_agents import NewsAgents
 # TASKS
 class NewsTasks():
 
+    def __init__(self, output_dir=".", deadline=None):
+        # Reports are written in output_dir, one directory per run keeps runs apart
+        self.output_dir = output_dir
+        # Once this deadline is cancelled, the run is abandoned and its outputs are dropped
+        self.deadline = deadline
+
+    def _cancelled(self):
+        return self.deadline is not None and self.deadline.cancelled
+
+    # Characters kept from each recalled note, so memory doesn't bloat the prompt
+    MEMORY_NOTE_CHARS = 300
+
+    # Recall related past outputs from a local memory and append them to the description
+    def _with_memory(self, description, memory, query):
+        if memory is None:
+            return description
+        recalled = memory.recall(query)
+        if not recalled:
+            return description
+        # Drop braces so recalled text isn't mistaken for {placeholders} at kickoff
+        notes = "\n".join(
+            f"- {re.sub(r'[{}]', '', item['context'])[:self.MEMORY_NOTE_CHARS]}" for item in recalled
+        )
+        return f"{description}\n            Related notes from previous runs (use only if still relevant):\n{notes}\n"
+
+    # Save the task output into a local memory once the task is done
+    def _remember_callback(self, memory, topic):
+        if memory is None:
+            return None
+        def remember(output):
+            if self._cancelled():
+                return
+            memory.remember(getattr(output, 'raw', str(output)), {"topic": topic})
+        return remember
+
     # Task: Location
-    def news_task(self, topic, agent):
-        return Task(
-            description=f"""Use news_search tool to collect 11 recent news articles about {topic}.
+    def news_task(self, topic, agent, memory=None):
+        description = f"""Use news_search tool to collect 11 recent news articles about {topic}.
             Then, compile them into 11 rich articles, each article 'body' along with 'source', article's 'date', 'image' and 'url'. 
             Please, proceed with first results you got, when Using news_search tool.
-            """,
+            """
+        return Task(
+            description=self._with_memory(description, memory, topic),
             expected_output ="""
             In markdown format with sections and bullets : A rich News Letter post with the 11 articles 'body', along with article's 'source', 'date' and 'url'.
             Use emojies in accordance in the beginings of the sections's titles.
@@ -32,17 +69,19 @@ class NewsTasks():
             [here display in a list : date, source, url of the news]
             """,
             agent=agent,
-            output_file='report_task_news.md',
+            callback=self._remember_callback(memory, topic),
+            output_file=os.path.join(self.output_dir, 'report_task_news.md'),
         )
 
     # Task: Location
-    def writer_task(self, topic, agent, context):    
-        return Task(
-            description=f"""
+    def writer_task(self, topic, agent, context, memory=None):
+        description = f"""
             Develop a rich paragraph about {topic} trends based on the news as an introduction.
             Then, following below : render the 11 articles from news_agent context
             in a long news letter post with introduction and sections about {topic}.
-            """,
+            """
+        return Task(
+            description=self._with_memory(description, memory, topic),
             expected_output="""
             A rich structured News Letter post in markdown format.
             Use emojies in accordance in the beginings of the sections's titles.
@@ -58,7 +97,8 @@ class NewsTasks():
             """,
             agent=agent,
             context=[context],
-            output_file='report_task_writer.md',
+            callback=self._remember_callback(memory, topic),
+            output_file=os.path.join(self.output_dir, 'report_task_writer.md'),
         )
 
     # tip section
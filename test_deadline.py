@@ -0,0 +1,152 @@
+import threading
+import time
+import pytest
+from duckduckgo_search.exceptions import DuckDuckGoSearchException, TimeoutException
+from litellm.exceptions import Timeout as LLMTimeout
+import DuckSearchTools
+import deadline
+from deadline import Deadline, DeadlineExceeded, stage_timeout, use_deadline
+from news_crew import TheCrew
+
+@pytest.fixture(autouse=True)
+def clear_overruns():
+    deadline.OVERRUNS.clear()
+    yield
+    deadline.OVERRUNS.clear()
+
+def test_slice_is_a_share_of_what_is_left():
+    budget = Deadline(100)
+    assert 49 < budget.slice("news_agent") <= 50
+    assert 24 < budget.slice("search") <= 25
+
+def test_slice_minimum():
+    budget = Deadline(0)
+    assert budget.slice("search") == 1.0
+    assert budget.slice("search", minimum=0.0) == 0.0
+
+def test_sub_leaves_parent_untouched():
+    parent = Deadline(100)
+    child = parent.sub("crew")
+    assert 89 < child.remaining() <= 90
+    child.cancel()
+    assert child.expired
+    assert not parent.expired and not parent.cancelled
+
+def test_cancel_expires_and_suppresses_overruns():
+    budget = Deadline(100)
+    budget.cancel()
+    assert budget.expired and budget.cancelled
+    with pytest.raises(DeadlineExceeded):
+        budget.check("search")
+    assert deadline.overrun_counts() == {}
+
+def test_overrun_counted_once_per_stage():
+    budget = Deadline(0)
+    for _ in range(3):
+        with pytest.raises(DeadlineExceeded):
+            budget.check("search")
+    budget.overrun("pdf")
+    budget.overrun("pdf")
+    assert deadline.overrun_counts() == {"search": 1, "pdf": 1}
+
+def test_deadline_exceeded_is_a_timeout():
+    assert issubclass(DeadlineExceeded, TimeoutError)
+
+def test_stage_timeout():
+    assert stage_timeout("search", 10) == 10
+    with use_deadline(Deadline(100)):
+        assert stage_timeout("search", 10) == 10
+        assert 4 < stage_timeout("search", None) <= 25
+    with use_deadline(Deadline(0)):
+        with pytest.raises(DeadlineExceeded):
+            stage_timeout("search", 10)
+
+class FakeDDGS:
+    """Stands in for DDGS, its news() behaviour is set per test"""
+    news_call = None
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+
+    def news(self, *args, **kwargs):
+        return FakeDDGS.news_call()
+
+@pytest.fixture
+def fake_ddgs(monkeypatch):
+    monkeypatch.setattr(DuckSearchTools, "DDGS", FakeDDGS)
+    return FakeDDGS
+
+def news(ddgs):
+    return ddgs.news("topic")
+
+def test_search_skipped_after_deadline(fake_ddgs):
+    fake_ddgs.news_call = lambda: pytest.fail("DDGS must not be called")
+    with use_deadline(Deadline(0)):
+        assert DuckSearchTools._search(news) == DuckSearchTools.SEARCH_SKIPPED
+    assert deadline.overrun_counts() == {"search": 1}
+
+def test_search_bounded_as_a_whole(fake_ddgs):
+    fake_ddgs.news_call = lambda: time.sleep(2) or ["late"]
+    with use_deadline(Deadline(4)):
+        started = time.monotonic()
+        assert DuckSearchTools._search(news) == DuckSearchTools.SEARCH_TIMED_OUT
+        assert time.monotonic() - started < 1.5
+    assert deadline.overrun_counts() == {"search": 1}
+
+def test_search_wrapped_timeout_counted(fake_ddgs):
+    def wrapped_timeout():
+        raise DuckDuckGoSearchException(TimeoutException("https://duckduckgo.com timed out"))
+    fake_ddgs.news_call = wrapped_timeout
+    assert DuckSearchTools._search(news) == DuckSearchTools.SEARCH_TIMED_OUT
+    assert deadline.overrun_counts() == {"search": 1}
+
+def test_search_other_errors_raise(fake_ddgs):
+    def ratelimit():
+        raise DuckDuckGoSearchException("202 Ratelimit")
+    fake_ddgs.news_call = ratelimit
+    with pytest.raises(DuckDuckGoSearchException):
+        DuckSearchTools._search(news)
+
+class FakeTask:
+    output_file = "report.md"
+
+class FakeCrew:
+    """Stands in for Crew, kickoff() runs the given function"""
+
+    def __init__(self, kickoff):
+        self._kickoff = kickoff
+        self.tasks = [FakeTask(), FakeTask()]
+
+    def kickoff(self, inputs):
+        return self._kickoff()
+
+class FakeOutput:
+    raw = "aggregated news"
+
+def raise_llm_timeout():
+    raise LLMTimeout(message="Request timed out", model="gemini/gemini-2.0-flash", llm_provider="gemini")
+
+def test_kickoff_returns_partial_on_llm_timeout():
+    the_crew = TheCrew("topic", "model")
+    crew = FakeCrew(raise_llm_timeout)
+    output = FakeOutput()
+    assert the_crew._kickoff_with_deadline(crew, Deadline(5), [output]) is output
+    assert the_crew.partial
+    assert deadline.overrun_counts() == {"writer_agent": 1}
+    assert all(task.output_file is None for task in crew.tasks)
+
+def test_kickoff_returns_placeholder_on_overrun():
+    release = threading.Event()
+    the_crew = TheCrew("topic", "model")
+    crew_deadline = Deadline(0.2)
+    result = the_crew._kickoff_with_deadline(FakeCrew(lambda: release.wait(5)), crew_deadline, [])
+    release.set()
+    assert isinstance(result, str) and "deadline" in result
+    assert the_crew.partial and crew_deadline.cancelled
+    assert deadline.overrun_counts() == {"news_agent": 1}
+
+def test_kickoff_raises_other_errors():
+    def fail():
+        raise ValueError("bad config")
+    with pytest.raises(ValueError):
+        TheCrew("topic", "model")._kickoff_with_deadline(FakeCrew(fail), Deadline(5), [])
@@ -0,0 +1,91 @@
+import pytest
+from deadline import Deadline
+from local_memory import LocalMemory, get_local_memory
+from news_agents import NewsAgents
+from news_tasks import NewsTasks
+
+GREEN_ENERGY = """# 🌱 Introduction
+## Green energy momentum accelerates worldwide
+This week in green energy, solar and wind installations hit new records while governments expanded
+clean power incentives. Battery storage costs kept falling, and utilities announced grid upgrades.
+---
+# 📰 The News Letter for Green Energy
+### Solar capacity surges in Europe
+Europe added record solar capacity in the first half of the year, driven by rooftop installations.
+- Date: 2025-09-14
+- Source: Reuters
+- URL: https://www.reuters.com/business/energy/solar-europe
+### Green hydrogen plant opens
+A green hydrogen plant powered by renewable energy opened in Texas.
+- Date: 2025-09-12
+- Source: Bloomberg
+- URL: https://www.bloomberg.com/green-hydrogen
+"""
+
+def test_recall_same_topic():
+    memory = LocalMemory()
+    memory.remember(GREEN_ENERGY, {"topic": "Green Energy"})
+    recalled = memory.recall("Green Energy")
+    assert recalled
+    assert "energy" in recalled[0]["context"].lower()
+
+def test_recall_other_topic_returns_nothing():
+    memory = LocalMemory()
+    memory.remember(GREEN_ENERGY, {"topic": "Green Energy"})
+    assert memory.recall("Space Exploration") == []
+
+def test_index_is_capped():
+    memory = LocalMemory(max_items=5)
+    words = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel"]
+    for word in words:
+        memory.remember(f"{word} solar")
+    assert memory.stats()["items"] == 5
+    # The oldest items were evicted, the newest are still recalled
+    assert memory.recall("alpha") == []
+    assert memory.recall("hotel")[0]["context"] == "hotel solar"
+
+def test_memories_are_per_store():
+    first, second = {}, {}
+    get_local_memory(first, "news_agent").remember(GREEN_ENERGY)
+    assert get_local_memory(first, "news_agent").recall("Green Energy")
+    assert get_local_memory(second, "news_agent").recall("Green Energy") == []
+
+def test_memory_mode_per_agent():
+    agents = NewsAgents("model", memory={"news_agent": "off"})
+    assert agents.memory_mode("news_agent") == "off"
+    # Agents missing from the dict get the local backend
+    assert agents.memory_mode("writer_agent") == "local"
+    assert agents.local_memory("news_agent") is None
+    assert agents.local_memory("writer_agent") is not None
+
+def test_memory_mode_unknown():
+    agents = NewsAgents("model", memory="vector-db")
+    with pytest.raises(ValueError):
+        agents.memory_mode("news_agent")
+
+def test_crew_memory_on_for_any_crewai_agent():
+    assert not NewsAgents("model", memory="local").crew_memory()
+    assert NewsAgents("model", memory={"writer_agent": "crewai"}).crew_memory()
+
+def test_with_memory_unchanged_without_recall():
+    tasks = NewsTasks()
+    assert tasks._with_memory("describe", None, "Green Energy") == "describe"
+    assert tasks._with_memory("describe", LocalMemory(), "Green Energy") == "describe"
+
+def test_with_memory_strips_braces_and_caps_notes():
+    memory = LocalMemory(chunk_size=2000)
+    memory.remember("{topic} Green Energy " * 50)
+    description = NewsTasks()._with_memory("describe", memory, "Green Energy")
+    notes = description.split("\n")[-2]
+    assert "{" not in description and "}" not in description
+    assert len(notes) == len("- ") + NewsTasks.MEMORY_NOTE_CHARS
+
+def test_remember_callback_skips_after_cancel():
+    memory = LocalMemory()
+    deadline = Deadline(60)
+    remember = NewsTasks(deadline=deadline)._remember_callback(memory, "Green Energy")
+    remember(GREEN_ENERGY)
+    saved = memory.stats()["items"]
+    deadline.cancel()
+    remember(GREEN_ENERGY)
+    assert memory.stats()["items"] == saved